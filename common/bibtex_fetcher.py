@@ -0,0 +1,445 @@
+import os
+import re
+import csv
+import html
+import time
+import sqlite3
+import logging
+import random
+import asyncio
+import argparse
+from itertools import islice
+from collections import namedtuple
+from urllib.parse import urlsplit, urlunsplit
+import aiohttp
+from tqdm import tqdm
+
+# pyarrow is optional; when installed, the previous output is parsed in C
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+logger = logging.getLogger("BibTeX Fetcher")
+
+# BibTeX cache shared by the conference and journal fetchers (repository root);
+# both may use it at the same time, see BibtexCache
+DEFAULT_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bibtex_cache.sqlite"
+)
+
+# Maximum number of BibTeX requests in flight at the same time
+MAX_CONCURRENCY = 50
+# Upper bound (in seconds) of the random delay before each request
+MAX_JITTER = 0.2
+# Retry policy for connection errors and timeouts (exponential backoff)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+# The BibTeX entry is the <pre> block inside div#bibtex-section of the DBLP page
+BIBTEX_RE = re.compile(r'<div[^>]*\bid="bibtex-section"[^>]*>.*?<pre[^>]*>(.*?)</pre>', re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
+
+# Placeholders written to bibtex_data when no entry could be fetched
+BAD_SENTINELS = frozenset({"Not Available", "No URL"})
+
+HttpResponse = namedtuple("HttpResponse", ["status", "text", "etag", "last_modified"])
+
+# Number of input rows fetched and written per batch
+BATCH_SIZE = 1000
+# Write buffer of the output file, so finished batches reach the disk in few large writes
+WRITE_BUFFER_SIZE = 1 << 20
+# Cached entries older than this (in days) are revalidated with a conditional request
+CACHE_MAX_AGE = 30
+
+CacheEntry = namedtuple("CacheEntry", ["data", "etag", "last_modified", "fetched_at"])
+
+class BibtexCache:
+    """
+    Persistent bibtex_url -> BibTeX cache stored in SQLite.
+    The connection runs in autocommit mode with WAL journaling, so each write
+    holds the lock only for that statement and several fetchers can share
+    the file at the same time. Cache errors are logged and never fail a fetch.
+    """
+
+    def __init__(self, cachefile, max_age=CACHE_MAX_AGE):
+        self.conn = sqlite3.connect(cachefile, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bib (url TEXT PRIMARY KEY, data TEXT, fetched_at INTEGER, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        # Caches created before the validator columns existed are upgraded in place
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(bib)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE bib ADD COLUMN {column} TEXT")
+        self.max_age = max_age * 24 * 60 * 60
+
+    def get(self, url):
+        try:
+            row = self.conn.execute(
+                "SELECT data, etag, last_modified, fetched_at FROM bib WHERE url = ?", (url,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read BibTeX cache for {url}: {e}")
+            return None
+        return CacheEntry(*row) if row else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry.fetched_at < self.max_age
+
+    def put(self, url, data, etag=None, last_modified=None):
+        self._write(
+            url,
+            "INSERT OR REPLACE INTO bib (url, data, fetched_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+            (url, data, int(time.time()), etag, last_modified)
+        )
+
+    def touch(self, url):
+        """Mark an entry as fresh again after DBLP confirmed it is unchanged."""
+        self._write(url, "UPDATE bib SET fetched_at = ? WHERE url = ?", (int(time.time()), url))
+
+    def _write(self, url, sql, params):
+        try:
+            self.conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update BibTeX cache for {url}: {e}")
+
+    def close(self):
+        self.conn.close()
+
+def html_to_bib_url(bibtex_url):
+    """
+    Map a DBLP record page (.../rec/<key>.html?view=bibtex) to its plain-text
+    BibTeX export (.../rec/<key>.bib). Returns None for other URLs.
+    """
+    parts = urlsplit(bibtex_url)
+    if "/rec/" not in parts.path or not parts.path.endswith(".html"):
+        return None
+    return urlunsplit((parts.scheme, parts.netloc, parts.path[:-len(".html")] + ".bib", "", ""))
+
+async def http_get(session, url, headers=None):
+    """
+    GET the URL, retrying connection errors and timeouts with exponential backoff.
+    Returns an HttpResponse (the body is only read for 200), or None on failure.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.get(url, headers=headers) as response:
+                # Undecodable bytes must not abort the crawl, so replace them like requests did
+                text = await response.text(errors="replace") if response.status == 200 else None
+                return HttpResponse(
+                    response.status, text,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified")
+                )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                logger.error(f"Failed to fetch BibTeX from {url}: {e}")
+                return None
+            await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch BibTeX from {url}: {e}")
+            return None
+
+async def fetch_bibtex(session, cache, bibtex_url, entry=None):
+    """
+    Fetch BibTeX entry for the provided URL and store it in the cache.
+    DBLP's plain-text .bib export is requested first; the HTML page is only
+    scraped if the export does not exist. If a stale cache entry is given,
+    the request is made conditional on its validators, and a 304 response
+    returns the cached data without a download.
+    """
+    headers = {}
+    if entry:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    # Prefer the plain-text export; scrape the HTML page only if it does not exist
+    bib_url = html_to_bib_url(bibtex_url)
+    response = await http_get(session, bib_url, headers) if bib_url else None
+    from_html = bib_url is None or (response is not None and response.status == 404)
+    if from_html:
+        response = await http_get(session, bibtex_url, headers)
+    if response is None:
+        return None
+
+    if entry and response.status == 304:
+        cache.touch(bibtex_url)
+        return entry.data
+    if response.status != 200:
+        logger.error(f"Failed to fetch BibTeX from {bibtex_url}: HTTP {response.status}")
+        return None
+
+    if from_html:
+        match = BIBTEX_RE.search(response.text)
+        bibtex_data = html.unescape(TAG_RE.sub("", match.group(1))).strip() if match else None
+    else:
+        bibtex_data = response.text.strip()
+    if not bibtex_data:
+        logger.warning(f"No BibTeX section found for URL: {bibtex_url}")
+        return None
+
+    cache.put(bibtex_url, bibtex_data, response.etag, response.last_modified)
+    return bibtex_data
+
+async def fetch_all(session, semaphore, bibtex_urls, cache):
+    """
+    Fetch BibTeX entries for all URLs concurrently.
+    URLs with a fresh cache entry are not requested again, stale entries are
+    revalidated, and newly fetched entries are added to the cache.
+    Each distinct URL is requested at most once; results are returned in the
+    same order as the given URLs.
+    """
+    unique_urls = list(dict.fromkeys(bibtex_urls))
+    entries = {url: cache.get(url) for url in unique_urls}
+    results = {url: entry.data for url, entry in entries.items() if entry and cache.is_fresh(entry)}
+
+    async def fetch_one(bibtex_url):
+        async with semaphore:
+            # Spread requests out a little so DBLP is not hit in bursts
+            await asyncio.sleep(random.uniform(0, MAX_JITTER))
+            return await fetch_bibtex(session, cache, bibtex_url, entries[bibtex_url])
+
+    # One failing URL must not abort the whole batch, so exceptions are collected per URL
+    missing = [url for url in unique_urls if url not in results]
+    outcomes = await asyncio.gather(*(fetch_one(url) for url in missing), return_exceptions=True)
+    for bibtex_url, bibtex_data in zip(missing, outcomes):
+        if isinstance(bibtex_data, Exception):
+            logger.error(f"Failed to fetch BibTeX from {bibtex_url}: {bibtex_data!r}")
+            bibtex_data = None
+        # Fall back to the stale cached copy if DBLP could not be reached
+        entry = entries[bibtex_url]
+        results[bibtex_url] = bibtex_data or (entry.data if entry else None)
+
+    return [results[url] for url in bibtex_urls]
+
+async def crawl(reader, writer, header, processed_data, cache, max_concurrency=MAX_CONCURRENCY, total=None):
+    """
+    Stream rows from the reader in batches, fill in their BibTeX data and
+    write each finished batch, so only one batch is held in memory at a time.
+    Rows are plain lists indexed by the column positions found in the header.
+    """
+    title_idx = header.index("title")
+    url_idx = header.index("bibtex_url")
+    data_idx = header.index("bibtex_data")
+    width = len(header)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timeout = aiohttp.ClientTimeout(total=10)
+    # Keep-alive connections to DBLP are pooled and reused across requests
+    connector = aiohttp.TCPConnector(limit=max_concurrency, ttl_dns_cache=300)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        with tqdm(total=total, desc="Processing papers", leave=False) as progress:
+            for batch in iter(lambda: list(islice(reader, BATCH_SIZE)), []):
+                # Collect the rows that still need fetching
+                pending_rows = []
+                pending_urls = []
+                for row in batch:
+                    # Pad short rows so that every column, including bibtex_data, exists
+                    if len(row) < width:
+                        row.extend([""] * (width - len(row)))
+                    # Strip once and store the result, so later passes over the output reuse it
+                    title = row[title_idx] = row[title_idx].strip()
+                    bibtex_url = row[url_idx] = row[url_idx].strip()
+
+                    # Use existing BibTeX data if available
+                    if title in processed_data:
+                        existing_bibtex = processed_data[title]
+                        if existing_bibtex and existing_bibtex not in BAD_SENTINELS:
+                            row[data_idx] = existing_bibtex
+                            continue
+
+                    # Fetch new BibTeX data if URL is provided
+                    if bibtex_url:
+                        pending_rows.append(row)
+                        pending_urls.append(bibtex_url)
+                    else:
+                        row[data_idx] = "No URL"
+
+                results = await fetch_all(session, semaphore, pending_urls, cache)
+                for row, bibtex_data in zip(pending_rows, results):
+                    row[data_idx] = bibtex_data if bibtex_data else "Not Available"
+
+                writer.writerows(batch)
+                progress.update(len(batch))
+
+def load_existing_data_arrow(outputfile, key_field="title"):
+    """
+    Read only the key and bibtex_data columns of the output file with pyarrow.
+    Returns None if the file cannot be read this way, e.g. a column is missing.
+    """
+    columns = [key_field, "bibtex_data"]
+    try:
+        table = pa_csv.read_csv(
+            outputfile,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns, column_types={column: pa.string() for column in columns}
+            )
+        )
+    except pa.ArrowException:
+        return None
+
+    # Strip whitespace column-wise in C rather than once per Python string
+    keys = pc.utf8_trim_whitespace(table.column(key_field)).to_pylist()
+    values = pc.utf8_trim_whitespace(table.column("bibtex_data")).to_pylist()
+    return {key: bibtex_data for key, bibtex_data in zip(keys, values) if key}
+
+def load_existing_data(outputfile, key_field="title"):
+    """
+    Load already processed records to avoid duplicate fetching.
+    Uses title as the unique key and maps it to the saved BibTeX data.
+    """
+    if pa is not None and os.path.exists(outputfile):
+        existing_data = load_existing_data_arrow(outputfile, key_field)
+        if existing_data is not None:
+            return existing_data
+
+    existing_data = {}
+    if os.path.exists(outputfile):
+        with open(outputfile, mode="r", encoding="utf-8", newline="") as infile:
+            reader = csv.reader(infile)
+            header = next(reader, [])
+            if key_field not in header or "bibtex_data" not in header:
+                return existing_data
+            key_idx = header.index(key_field)
+            data_idx = header.index("bibtex_data")
+            min_width = max(key_idx, data_idx) + 1
+            for row in reader:
+                if len(row) < min_width:
+                    continue
+                key = row[key_idx].strip()
+                if key:
+                    existing_data[key] = row[data_idx].strip()
+    return existing_data
+
+def count_rows(filename):
+    """
+    Count the data rows of a CSV file by counting line breaks instead of
+    parsing it. Assumes no field spans several lines, as in the crawler output.
+    """
+    lines = 0
+    last = b"\n"
+    with open(filename, mode="rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A final line without a trailing line break still counts
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+def print_statistics(inputfile, outputfile):
+    """
+    Print the number of total entries and successfully fetched BibTeX records.
+    """
+    total_entries = 0
+    if os.path.exists(inputfile):
+        total_entries = count_rows(inputfile)
+    else:
+        logger.warning(f"Input file '{inputfile}' does not exist.")
+
+    success_entries = 0
+    if os.path.exists(outputfile):
+        with open(outputfile, mode="r", encoding="utf-8", newline="") as outfile:
+            reader = csv.reader(outfile)
+            header = next(reader, [])
+            if "bibtex_data" in header:
+                data_idx = header.index("bibtex_data")
+                for row in reader:
+                    bibtex = row[data_idx].strip() if len(row) > data_idx else ""
+                    if bibtex and bibtex not in BAD_SENTINELS:
+                        success_entries += 1
+
+    logger.error(f"Total entries in {inputfile}: {total_entries}")
+    logger.error(f"Successfully fetched BibTeX entries in {outputfile}: {success_entries}")
+
+def process_csv(inputfile, outputfile, max_concurrency=MAX_CONCURRENCY, cachefile=DEFAULT_CACHE_FILE,
+                cache_max_age=CACHE_MAX_AGE, buffer_size=WRITE_BUFFER_SIZE):
+    """
+    Process the input CSV file and write BibTeX entries to the output file.
+    Rows are streamed batch by batch into a temporary file, which replaces the
+    output file only once the crawl has finished. An interrupted crawl thus
+    keeps the previous output; entries fetched before the interruption are
+    still in the BibTeX cache for the next run.
+    """
+    processed_data = load_existing_data(outputfile, key_field="title")
+    tmpfile = outputfile + ".tmp"
+
+    cache = BibtexCache(cachefile, cache_max_age)
+    try:
+        with open(inputfile, mode="r", encoding="utf-8", newline="") as infile, \
+                open(tmpfile, mode="w", encoding="utf-8", newline="", buffering=buffer_size) as outfile:
+            reader = csv.reader(infile)
+            header = next(reader, [])
+            if "title" not in header or "bibtex_url" not in header:
+                logger.error(f"Input file '{inputfile}' must have 'title' and 'bibtex_url' columns.")
+                return
+            if "bibtex_data" not in header:
+                header.append("bibtex_data")
+
+            writer = csv.writer(outfile)
+            writer.writerow(header)
+            asyncio.run(crawl(
+                reader, writer, header, processed_data, cache, max_concurrency, total=count_rows(inputfile)
+            ))
+        os.replace(tmpfile, outputfile)
+    finally:
+        cache.close()
+        # Only left behind if the crawl failed; the previous output is untouched
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+
+def int_at_least(minimum):
+    """Build an argparse type that accepts integers not smaller than minimum."""
+    def parse(value):
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+    # argparse names the type in its "invalid <type> value" message
+    parse.__name__ = "int"
+    return parse
+
+def parse_args(description, inputfile, outputfile):
+    """Parse the command-line arguments shared by the conference and journal fetchers."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--inputfile", default=inputfile, metavar="*.csv",
+        help=f"Input CSV file with a 'bibtex_url' column. Default: {inputfile}"
+    )
+    parser.add_argument(
+        "--outputfile", default=outputfile, metavar="*.csv",
+        help=f"Output CSV file to save BibTeX results. Default: {outputfile}"
+    )
+    parser.add_argument(
+        "--workers", type=int_at_least(1), default=MAX_CONCURRENCY, metavar="INT",
+        help=f"Maximum number of concurrent BibTeX requests. Lower it to be gentler on DBLP. Default: {MAX_CONCURRENCY}"
+    )
+    parser.add_argument(
+        "--cachefile", default=DEFAULT_CACHE_FILE, metavar="*.sqlite",
+        help="SQLite file caching fetched BibTeX entries by URL. Default: bibtex_cache.sqlite in the repository root"
+    )
+    parser.add_argument(
+        "--cachemaxage", type=float, default=CACHE_MAX_AGE, metavar="DAYS",
+        help=f"Age after which cached entries are revalidated with DBLP (ETag/Last-Modified). Default: {CACHE_MAX_AGE}"
+    )
+    parser.add_argument(
+        "--writebuffer", type=int_at_least(2), default=WRITE_BUFFER_SIZE, metavar="BYTES",
+        help=f"Write buffer size of the output file, at least 2 (text files cannot be unbuffered, "
+             f"and 1 means line buffering). Default: {WRITE_BUFFER_SIZE} (1 MiB)"
+    )
+    return parser.parse_args()
+
+def run(inputfile, outputfile, max_concurrency=MAX_CONCURRENCY, cachefile=DEFAULT_CACHE_FILE,
+        cache_max_age=CACHE_MAX_AGE, buffer_size=WRITE_BUFFER_SIZE):
+    """Print the current statistics, then fetch the missing BibTeX entries of the input file."""
+    print_statistics(inputfile, outputfile)
+    process_csv(inputfile, outputfile, max_concurrency, cachefile, cache_max_age, buffer_size)